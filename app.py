@@ -1,16 +1,14 @@
+import atexit
 import os
 import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-import html
 
 import streamlit as st
-import streamlit.components.v1 as components
-
-# Google Sheets logging
-import gspread
-from google.oauth2 import service_account
-from datetime import datetime
-from zoneinfo import ZoneInfo
 
 
 # =========================
@@ -21,6 +19,17 @@ FAVICON_URL = "https://mocainteractive.com/wp-content/uploads/2025/04/cropped-mo
 
 # Modello: nascosto nel frontend, sovrascrivibile da Secrets
 MODEL_DEFAULT = st.secrets.get("OPENAI_MODEL", "gpt-4o-mini")
+ENABLE_ENGLISH = bool(st.secrets.get("ENABLE_ENGLISH", False))
+
+# Log su Google Sheet attivo solo se configurato in Secrets
+LOGGING_ENABLED = bool(st.secrets.get("gcp_service_account")) and bool(st.secrets.get("LOG_SHEET_ID"))
+
+LOGO_HTML = f"""
+    <div style="display:flex;align-items:center;gap:12px;margin-top:-8px;">
+      <img src="{LOGO_URL}" alt="Moca Interactive" style="height:40px;">
+      <h1 style="margin:0;font-weight:700;">SEO Writer</h1>
+    </div>
+    """
 
 
 # =========================
@@ -29,13 +38,12 @@ MODEL_DEFAULT = st.secrets.get("OPENAI_MODEL", "gpt-4o-mini")
 def clean_domain(url: str) -> str:
     try:
         netloc = urlparse(url).netloc
-        return netloc.replace("www.", "") if netloc else ""
+        return netloc.removeprefix("www.") if netloc else ""
     except Exception:
         return ""
 
 
-def char_count(text: str) -> int:
-    return len(text)
+_SENT_END_RE = re.compile(r"(.+[\.!?])[^\.!?]*$", re.S)  # testo fino all'ultima fine frase
 
 
 def enforce_length(text: str, min_c: int, max_c: int) -> str:
@@ -43,77 +51,213 @@ def enforce_length(text: str, min_c: int, max_c: int) -> str:
     if len(text) <= max_c:
         return text
     trimmed = text[:max_c]
-    m = re.search(r"(.+[\.!?])[^\.!?]*$", trimmed, re.S)
+    m = _SENT_END_RE.search(trimmed)
     return m.group(1) if m else trimmed
 
 
+@st.cache_resource(show_spinner=False)
+def _get_worksheet():
+    """Autenticazione e apertura del foglio di log, una sola volta per processo."""
+    # import locali: le librerie Google servono solo se il log è attivo
+    import gspread
+    from google.oauth2 import service_account
+
+    creds = service_account.Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=[
+            "https://www.googleapis.com/auth/spreadsheets",
+            "https://www.googleapis.com/auth/drive",
+        ],
+    )
+    gc = gspread.authorize(creds)
+    return gc.open_by_key(st.secrets["LOG_SHEET_ID"]).worksheet(st.secrets.get("LOG_SHEET_NAME", "logs"))
+
+
+LOG_BATCH_SIZE = 5  # righe accumulate prima di scrivere sullo Sheet
+LOG_BUFFER_MAX = 200  # righe in attesa oltre le quali si scartano le più vecchie (Sheet non raggiungibile)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_log_buffer():
+    """Buffer condiviso tra le sessioni; quello che resta viene scritto all'uscita del processo."""
+    buf = {"rows": [], "lock": threading.Lock()}
+    atexit.register(lambda: _append_log_rows(_take_log_rows(buf)))
+    return buf
+
+
+def _take_log_rows(buf) -> list:
+    with buf["lock"]:
+        rows, buf["rows"] = buf["rows"], []
+    return rows
+
+
+def _append_log_rows(rows: list):
+    """Scrive in un'unica chiamata le righe accumulate; restituisce l'eventuale errore."""
+    if not rows:
+        return None
+    buf = _get_log_buffer()
+    try:
+        import gspread
+
+        try:
+            _get_worksheet().append_rows(rows, value_input_option="USER_ENTERED", insert_data_option="INSERT_ROWS")
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code != 401:
+                raise
+            # token scaduto/revocato: ricrea il client e riprova una volta
+            _get_worksheet.clear()
+            _get_worksheet().append_rows(rows, value_input_option="USER_ENTERED", insert_data_option="INSERT_ROWS")
+    except Exception as e:
+        # rimette le righe in coda: verranno riprovate al prossimo flush
+        with buf["lock"]:
+            buf["rows"][:0] = rows
+            del buf["rows"][:-LOG_BUFFER_MAX]
+        return e
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _get_log_pool() -> ThreadPoolExecutor:
+    """Un solo worker: i log vengono scritti in ordine, senza bloccare la UI."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="log")
+
+
 def log_to_sheet(keyword: str, url: str, ctype: str, language: str, chars: int, model: str):
     """
-    Scrive una riga sullo Sheet configurato in Secrets.
+    Accoda una riga per lo Sheet configurato in Secrets; la scrittura avviene a blocchi di LOG_BATCH_SIZE.
     Colonne: N | Data | Ora | Keyword | URL | Tipo | Lingua | Caratteri | Modello
+    Gira nel pool dei log: non usa la UI, restituisce l'errore del flush fatto da questa chiamata.
     """
+    if not LOGGING_ENABLED:
+        return None  # non bloccare l'app se manca la configurazione
+
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
     try:
-        sheet_id = st.secrets["LOG_SHEET_ID"]
-        sheet_name = st.secrets.get("LOG_SHEET_NAME", "logs")
         tzname = st.secrets.get("TIMEZONE", "Europe/Rome")
-        sa_info = st.secrets.get("gcp_service_account")
-        if not sa_info:
-            return  # non bloccare l'app se manca la configurazione
-
-        creds = service_account.Credentials.from_service_account_info(
-            sa_info,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive",
-            ],
-        )
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_key(sheet_id)
-        ws = sh.worksheet(sheet_name)
+        buf = _get_log_buffer()
 
         now = datetime.now(ZoneInfo(tzname))
         d = now.strftime("%Y-%m-%d")
         t = now.strftime("%H:%M:%S")
 
-        n = len(ws.get_all_values())  # progressivo (header compreso)
+        # progressivo calcolato dallo Sheet (header escluso): evita di rileggere tutte le righe
+        n = "=ROW()-1"
         row = [n, d, t, keyword or "", url or "", ctype or "", language or "", int(chars), model or ""]
-        ws.append_row(row, value_input_option="USER_ENTERED")
+        with buf["lock"]:
+            buf["rows"].append(row)
+            full = len(buf["rows"]) >= LOG_BATCH_SIZE
+        if full:
+            return _append_log_rows(_take_log_rows(buf))
+        return None
     except Exception as e:
-        st.info(f"ℹ️ Log non registrato: {e}")
+        return e
 
 
 # =========================
 # LLM client (OpenAI)
 # =========================
+OPENAI_TIMEOUT = 60.0  # secondi, anche tra un chunk e l'altro dello stream (default openai: 600)
+OPENAI_CONNECT_TIMEOUT = 5.0  # come il default openai
+
+
+@st.cache_resource(show_spinner=False)
+def _openai_client(key: str):
+    """Un client per API key: il pool di connessioni (TLS già aperto) resta vivo tra i rerun."""
+    from openai import OpenAI, Timeout  # type: ignore
+    # cambia solo il read timeout: se l'upstream si blocca l'errore arriva dopo 60 s invece che dopo ~10 minuti
+    # (connect e retry restano quelli di default della libreria: 5 s e 2 tentativi)
+    return OpenAI(api_key=key, timeout=Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT))
+
+
 def get_openai_client():
     key = st.secrets.get("OPENAI_API_KEY", "") or os.getenv("OPENAI_API_KEY", "")
     if not key:
         st.error("⚠️ Inserisci una API key valida (Secrets: OPENAI_API_KEY).")
         return None
     try:
-        from openai import OpenAI  # type: ignore
-        return OpenAI(api_key=key)
+        return _openai_client(key)
     except Exception as e:
         st.error(f"Errore di import/inizializzazione OpenAI: {e}")
         return None
 
 
+MAX_FIX_RETRIES = 1  # nuove chiamate al modello se il testo resta sotto il minimo
+
+
+def stream_openai(client, model: str, system_prompt: str, user_prompt: str,
+                  temperature: float = 0.5, max_tokens: int = 1000):
+    """Generatore dei pezzi di testo man mano che il modello li produce."""
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stop=["\n\n\n"],  # il testo è un unico blocco: oltre non serve generare
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
+
+
 def call_openai(client, model: str, system_prompt: str, user_prompt: str,
                 temperature: float = 0.5, max_tokens: int = 1000) -> str:
+    """Chiamata in streaming: mostra il testo man mano che arriva, restituisce il testo completo."""
+    placeholder = st.empty()
+    # visibile finché non arriva il primo chunk (TTFT lento, retry del client)
+    placeholder.caption("Generazione in corso...")
     try:
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        return (resp.choices[0].message.content or "").strip()
+        with placeholder:
+            content = st.write_stream(
+                stream_openai(client, model, system_prompt, user_prompt, temperature, max_tokens)
+            )
+        return (content or "").strip()
     except Exception as e:
         st.error(f"Errore chiamando il modello: {e}")
         return ""
+    finally:
+        # l'anteprima viene sostituita dal testo finale (dopo il trimming)
+        placeholder.empty()
+
+
+RESPONSE_CACHE_TTL = 3600  # secondi
+RESPONSE_CACHE_MAX = 256  # testi in cache, oltre si scartano i meno usati
+
+
+@st.cache_resource(show_spinner=False)
+def _get_response_cache():
+    """Cache dei soli testi generati (niente elementi UI): chiave richiesta -> (scadenza, testo)."""
+    return {"items": OrderedDict(), "lock": threading.Lock()}
+
+
+def cached_generate(client, model: str, system_prompt: str, user_prompt: str,
+                    temperature: float = 0.5, max_tokens: int = 1000) -> str:
+    """Come call_openai, ma una richiesta identica (prompt, modello, parametri) torna dalla cache per un'ora."""
+    key = (system_prompt, user_prompt, model, temperature, max_tokens, st.session_state.get("cache_salt", ""))
+    cache = _get_response_cache()
+    now = time.monotonic()
+    with cache["lock"]:
+        hit = cache["items"].get(key)
+        if hit is not None and hit[0] > now:
+            cache["items"].move_to_end(key)
+            return hit[1]
+
+    # miss: streaming visibile all'utente, poi si salva solo il testo (gli errori non finiscono in cache)
+    content = call_openai(client, model, system_prompt, user_prompt,
+                          temperature=temperature, max_tokens=max_tokens)
+    if content:
+        with cache["lock"]:
+            items = cache["items"]
+            items[key] = (now + RESPONSE_CACHE_TTL, content)
+            items.move_to_end(key)
+            while len(items) > RESPONSE_CACHE_MAX:
+                items.popitem(last=False)
+    return content
 
 
 # =========================
@@ -121,56 +265,73 @@ def call_openai(client, model: str, system_prompt: str, user_prompt: str,
 # =========================
 st.set_page_config(page_title="SEO Writer", page_icon=FAVICON_URL, layout="wide")
 
-st.markdown(
-    f"""
-    <div style="display:flex;align-items:center;gap:12px;margin-top:-8px;">
-      <img src="{LOGO_URL}" alt="Moca Interactive" style="height:40px;">
-      <h1 style="margin:0;font-weight:700;">SEO Writer</h1>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+# Esito del log della generazione precedente (scritto in background)
+log_future = st.session_state.get("log_future")
+if log_future is not None and log_future.done():
+    del st.session_state["log_future"]
+    log_error = log_future.exception() or log_future.result()
+    if log_error:
+        st.toast(f"ℹ️ Log non registrato: {log_error}")
+
+st.markdown(LOGO_HTML, unsafe_allow_html=True)
 
 st.caption("Genera testi SEO per Smeg.com a partire da keyword, URL e indicazioni. Pensato per pagine di listing/categoria o di prodotto.")
 
-with st.sidebar:
+
+# I widget stanno in fragment: interagire con slider/campi riesegue solo il proprio blocco.
+# I valori si leggono da st.session_state (chiavi dei widget) nel blocco Run.
+@st.fragment
+def sidebar_settings():
     st.header("⚙️ Modello & API")
-    provider = st.selectbox("Provider", ["OpenAI"], index=0, help="Attualmente supportato: OpenAI")
-    temperature = st.slider("Temperature", 0.0, 1.2, 0.4, 0.1, help="Più alto = più creativo")
+    st.selectbox("Provider", ["OpenAI"], index=0, help="Attualmente supportato: OpenAI", key="provider")
+    st.slider("Temperature", 0.0, 1.2, 0.4, 0.1, help="Più alto = più creativo", key="temperature")
 
     st.header("✍️ Stile")
-    enable_en = bool(st.secrets.get("ENABLE_ENGLISH", False))
-    lang_options = ["Italiano"] + (["English (🔒 Pro)"] if not enable_en else ["English"])
-    lang_choice = st.selectbox("Lingua", lang_options, index=0)
-    language = "English" if ("English" in lang_choice and enable_en) else "Italiano"
-    if ("English" in lang_choice and not enable_en):
+    lang_options = ["Italiano"] + (["English (🔒 Pro)"] if not ENABLE_ENGLISH else ["English"])
+    lang_choice = st.selectbox("Lingua", lang_options, index=0, key="lang_choice")
+    if ("English" in lang_choice and not ENABLE_ENGLISH):
         st.info("Per sbloccare l'inglese contatta Moca per il pacchetto avanzato.")
 
-    tone = st.selectbox("Tono", ["professionale", "conversazionale", "autorevole", "persuasivo", "neutro"], index=0)
-    brand_voice = st.text_area("Voce del brand (opzionale)")
+    st.selectbox("Tono", ["professionale", "conversazionale", "autorevole", "persuasivo", "neutro"], index=0, key="tone")
+    st.text_area("Voce del brand (opzionale)", key="brand_voice")
 
     st.header("🔎 SEO")
     col_len1, col_len2 = st.columns(2)
     with col_len1:
-        target_min = st.number_input("Min caratteri", min_value=100, max_value=5000, value=500, step=50)
+        target_min = st.number_input("Min caratteri", min_value=100, max_value=5000, value=500, step=50, key="target_min")
     with col_len2:
-        target_max = st.number_input("Max caratteri", min_value=100, max_value=5000, value=600, step=50)
+        target_max = st.number_input("Max caratteri", min_value=100, max_value=5000, value=600, step=50, key="target_max")
     if target_min > target_max:
         st.warning("⚠️ Il minimo non può superare il massimo.")
-    target_chars = int((target_min + target_max) / 2)
 
-st.subheader("Dati di input")
-col1, col2 = st.columns(2)
-with col1:
-    keyword = st.text_input("Keyword principale", placeholder="es. frigoriferi da incasso")
-    url = st.text_input("URL di riferimento (per contesto e internal linking)")
-    content_type = st.selectbox("Tipo contenuto", ["Listing", "Scheda prodotto"], index=0)
-with col2:
-    intro_text = st.text_area("Testo introduttivo (opzionale)")
-    bullets = st.text_area("Bullet list (una per riga – per scheda prodotto)")
-    extra_guidelines = st.text_area("Linee guida aggiuntive (regole SEO, CTA, termini da usare/evitare)")
 
-start = st.button("🚀 Genera testo SEO")
+@st.fragment
+def input_fields():
+    st.subheader("Dati di input")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.text_input("Keyword principale", placeholder="es. frigoriferi da incasso", key="keyword")
+        st.text_input("URL di riferimento (per contesto e internal linking)", key="url")
+        st.selectbox("Tipo contenuto", ["Listing", "Scheda prodotto"], index=0, key="content_type")
+    with col2:
+        st.text_area("Testo introduttivo (opzionale)", key="intro_text")
+        st.text_area("Bullet list (una per riga – per scheda prodotto)", key="bullets")
+        st.text_area("Linee guida aggiuntive (regole SEO, CTA, termini da usare/evitare)", key="extra_guidelines")
+
+
+with st.sidebar:
+    sidebar_settings()
+input_fields()
+
+col_btn1, col_btn2 = st.columns(2)
+with col_btn1:
+    start = st.button("🚀 Genera testo SEO")
+with col_btn2:
+    regenerate = st.button("🔄 Rigenera", help="Ignora la cache e chiede un nuovo testo al modello")
+if regenerate:
+    # chiave nuova e unica (per sessione e per click): la cache è condivisa tra le sessioni
+    st.session_state["cache_salt"] = uuid.uuid4().hex
+    start = True
 
 
 # =========================
@@ -214,33 +375,54 @@ ISTRUZIONI:
 """.strip()
 
 
-# =========================
-# Run
-# =========================
-if start:
-    if not keyword.strip():
-        st.warning("Inserisci almeno la keyword principale.")
-        st.stop()
-
-    domain = clean_domain(url)
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_prompts(min_c: int, max_c: int, target_chars: int, ctype: str, keyword: str, url: str, domain: str,
+                  tone: str, brand_voice: str, extra_guidelines: str, language: str,
+                  intro_text: str, bullets: str) -> tuple[str, str]:
+    """Compila system e user prompt; a parità di input restituisce le stesse stringhe dalla cache."""
     system_prompt = SYSTEM_PROMPT_BASE.format(
-        min_c=target_min, max_c=target_max, target_chars=target_chars, ctype=content_type
+        min_c=min_c, max_c=max_c, target_chars=target_chars, ctype=ctype
     )
     user_prompt = USER_PROMPT_TEMPLATE.format(
         keyword=keyword,
         url=url or "(non fornito)",
         domain=domain or "(non disponibile)",
-        ctype=content_type,
+        ctype=ctype,
         tone=tone,
         brand_voice=brand_voice or "(non specificata)",
         extra_guidelines=extra_guidelines or "(nessuna)",
         language=language,
         intro_text=intro_text or "",
         bullets=bullets or "",
-        min_c=target_min,
-        max_c=target_max,
+        min_c=min_c,
+        max_c=max_c,
         target_chars=target_chars,
     )
+    return system_prompt, user_prompt
+
+
+# =========================
+# Run
+# =========================
+if start:
+    ss = st.session_state
+    provider, temperature = ss["provider"], ss["temperature"]
+    language = "English" if ("English" in ss["lang_choice"] and ENABLE_ENGLISH) else "Italiano"
+    tone, brand_voice = ss["tone"], ss["brand_voice"]
+    target_min, target_max = ss["target_min"], ss["target_max"]
+    target_chars = int((target_min + target_max) / 2)
+    keyword, url, content_type = ss["keyword"], ss["url"], ss["content_type"]
+    intro_text, bullets, extra_guidelines = ss["intro_text"], ss["bullets"], ss["extra_guidelines"]
+
+    if not keyword.strip():
+        st.warning("Inserisci almeno la keyword principale.")
+        st.stop()
+
+    domain = clean_domain(url)
+    system_prompt, user_prompt = build_prompts(
+        target_min, target_max, target_chars, content_type, keyword, url, domain,
+        tone, brand_voice, extra_guidelines, language, intro_text, bullets,
+    )
 
     if provider == "OpenAI":
         client = get_openai_client()
@@ -255,44 +437,50 @@ if start:
         )
         user_prompt = user_prompt + "\n\n" + output_rules
 
-        with st.spinner("Generazione in corso..."):
-            content = call_openai(
-                client, MODEL_DEFAULT, system_prompt, user_prompt,
-                temperature=temperature, max_tokens=1000
-            )
+        # budget token dal limite di caratteri (~3 caratteri/token + margine): l'eccesso lo taglia enforce_length
+        max_tokens = max(128, target_max // 3 + 64)
+        content = cached_generate(
+            client, MODEL_DEFAULT, system_prompt, user_prompt,
+            temperature=temperature, max_tokens=max_tokens
+        )
 
         if not content:
             st.stop()
 
-        # Primo conteggio e micro-fix se fuori range
-        cc = char_count(content)
-        if cc < target_min or cc > target_max:
+        # Prima il trimming lato client (gratis), poi un nuovo giro sul modello solo se il testo è troppo corto
+        # il testo arriva già ripulito da call_openai (strip)
+        content = enforce_length(content, target_min, target_max)
+        cc = len(content)
+        for _ in range(MAX_FIX_RETRIES):
+            if cc >= target_min:
+                break
             fix_prompt = (
                 f"Riscrivi mantenendo il senso ma rientrando tra {target_min}-{target_max} caratteri "
                 f"(spazi inclusi, target {target_chars}). Restituisci solo il contenuto, nessun commento."
             )
-            content = call_openai(
+            fixed = cached_generate(
                 client, MODEL_DEFAULT, system_prompt, content + "\n\n" + fix_prompt,
-                temperature=temperature, max_tokens=1000
+                temperature=temperature, max_tokens=max_tokens
             )
-            cc = char_count(content)
-
-        # Normalizza e ricalcola DOPO il trimming
-        content = enforce_length((content or "").strip(), target_min, target_max)
-        cc = char_count(content)
-
-        # Log su Google Sheet (non bloccare l'app se fallisce)
-        try:
-            log_to_sheet(
-                keyword=keyword,
-                url=url,
-                ctype=content_type,
-                language=language,
-                chars=cc,
-                model=MODEL_DEFAULT,
-            )
-        except Exception as e:
-            st.info(f"ℹ️ Log non registrato: {e}")
+            if not fixed:
+                break  # errore già mostrato: teniamo il testo precedente
+            content = enforce_length(fixed, target_min, target_max)
+            cc = len(content)
+
+        # Log su Google Sheet in background (non bloccare l'app se fallisce)
+        if LOGGING_ENABLED:
+            try:
+                st.session_state["log_future"] = _get_log_pool().submit(
+                    log_to_sheet,
+                    keyword=keyword,
+                    url=url,
+                    ctype=content_type,
+                    language=language,
+                    chars=cc,
+                    model=MODEL_DEFAULT,
+                )
+            except Exception as e:
+                st.info(f"ℹ️ Log non registrato: {e}")
 
         # Messaggio con conteggio esatto
         if cc < target_min or cc > target_max:
@@ -300,34 +488,9 @@ if start:
         else:
             st.success(f"Fatto ✅ — {cc} caratteri (target {target_min}-{target_max}).")
 
-        # Pulsante "Copia testo" compatto
-        escaped = html.escape(content)
-        components.html(f"""
-<div>
-  <button id="copyBtn" style="padding:8px 12px;border:1px solid #ddd;border-radius:8px;background:#fff;cursor:pointer">
-    📋 Copia testo
-  </button>
-  <textarea id="toCopy" style="position:absolute;left:-9999px;top:-9999px">{escaped}</textarea>
-</div>
-<script>
-  const btn = document.getElementById('copyBtn');
-  btn.addEventListener('click', async () => {{
-    const el = document.getElementById('toCopy');
-    try {{
-      await navigator.clipboard.writeText(el.value);
-      btn.innerText = '✅ Copiato!';
-    }} catch (e) {{
-      el.select();
-      document.execCommand('copy');
-      btn.innerText = '✅ Copiato!';
-    }}
-    setTimeout(() => btn.innerText = '📋 Copia testo', 1500);
-  }});
-</script>
-        """, height=70)
-
         st.divider()
-        st.markdown(content)
+        # st.code ha già l'icona "copia" nativa: niente iframe/JS dedicati
+        st.code(content, language=None, wrap_lines=True)
 
     else:
         st.error("Provider non supportato al momento.")